@@ -1,10 +1,18 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import logging
+import os
 
-from app.routes import scraper
+# Load environment variables before importing modules that read settings at import time
+load_dotenv()
+
+from app.routes import scraper, admin
+from app.services.admission import AdmissionController, AdmissionMiddleware
+from app.services.coordination import InMemoryBackend, get_backend
+from app.services.worker import start_local_workers
 
 # Configure logging
 logging.basicConfig(
@@ -17,14 +25,41 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start in-process workers when the in-memory coordination backend is used."""
+    backend = get_backend()
+    workers = []
+    if isinstance(backend, InMemoryBackend):
+        # Nothing outside this process can read an in-memory queue, so serve it here
+        workers = start_local_workers(backend, int(os.getenv("WORKER_CONCURRENCY", "1")))
+        logger.info(f"Started {len(workers)} in-process scrape worker(s)")
+    yield
+    for worker in workers:
+        worker.cancel()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Facebook Scraper API",
     description="API for scraping public Facebook pages",
     version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Configure admission control for scrape requests
+# (added before CORS so that rejections still carry CORS headers)
+admission_controller = AdmissionController(
+    max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "8")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "32")),
+    queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10")),
+    retry_after=int(os.getenv("ADMISSION_RETRY_AFTER", "1")),
+)
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission_controller,
+    api_keys=[key.strip() for key in os.getenv("ADMISSION_API_KEYS", "").split(",") if key.strip()],
 )
 
 # Configure CORS
@@ -38,6 +73,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(scraper.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional
+
+from app.models.schemas import FacebookPageData
+
+
+class PageResult:
+    """
+    Lightweight internal container for data scraped from a Facebook page.
+
+    Used by the scraper and parser instead of the pydantic model to avoid
+    per-page validation overhead. Convert with ``to_schema()`` at the API
+    boundary, or ``to_dict()`` for the fast JSON paths.
+    """
+
+    __slots__ = (
+        'page_name',
+        'page_url',
+        'email',
+        'phone',
+        'website',
+        'address',
+        'scraped_date',
+        'incomplete',
+    )
+
+    def __init__(
+        self,
+        page_name: Optional[str] = None,
+        page_url: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        website: Optional[str] = None,
+        address: Optional[str] = None,
+        scraped_date: Optional[str] = None,
+        incomplete: bool = False,
+    ):
+        self.page_name = page_name
+        self.page_url = page_url
+        self.email = email
+        self.phone = phone
+        self.website = website
+        self.address = address
+        self.scraped_date = scraped_date
+        self.incomplete = incomplete
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dict with the same keys as FacebookPageData."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_schema(self) -> FacebookPageData:
+        """Convert the result to the pydantic API schema."""
+        return FacebookPageData(**self.to_dict())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PageResult):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"PageResult({fields})"
@@ -5,6 +5,13 @@ from typing import List, Optional, Dict, Any
 class ScraperRequest(BaseModel):
     """Request model for Facebook page scraping."""
     url: HttpUrl = Field(..., description="Facebook page URL to scrape")
+    timeout: Optional[float] = Field(None, gt=0, description="Deadline in seconds for fetching and parsing the page (server default if omitted, capped at the server default)")
+
+
+class BatchScraperRequest(BaseModel):
+    """Request model for scraping several Facebook pages in one call."""
+    urls: List[HttpUrl] = Field(..., description="Facebook page URLs to scrape")
+    timeout: Optional[float] = Field(None, gt=0, description="Deadline in seconds for each page (server default if omitted, capped at the server default)")
 
 
 class FacebookPageData(BaseModel):
@@ -16,6 +23,7 @@ class FacebookPageData(BaseModel):
     website: Optional[str] = Field(None, description="Website link found on the page")
     address: Optional[str] = Field(None, description="Physical address found on the page")
     scraped_date: Optional[str] = Field(None, description="Date and time of scraping")
+    incomplete: bool = Field(False, description="True if the deadline was hit before all extraction methods ran")
 
 
 class ScraperResponse(BaseModel):
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Header, Query
+from typing import Optional
+from app.services.profiling import get_profiler
+from app.utils.helpers import is_valid_admin_token
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def _check_admin_token(token: Optional[str]) -> None:
+    """Reject the request if ADMIN_TOKEN is set and does not match."""
+    if not is_valid_admin_token(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/profiles")
+async def list_profiles(
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of captures to return"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    List the slowest recent profiling captures.
+    
+    Args:
+        limit: Maximum number of captures to return
+        x_admin_token: Admin token, required if ADMIN_TOKEN is set
+        
+    Returns:
+        dict: Capture metadata, slowest first
+    """
+    _check_admin_token(x_admin_token)
+    return {"profiles": get_profiler().slowest(limit)}
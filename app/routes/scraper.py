@@ -1,38 +1,147 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.models.schemas import ScraperRequest, ScraperResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header, Query
+from typing import Optional
+from fastapi.responses import StreamingResponse
+import asyncio
+from app.models.schemas import ScraperRequest, ScraperResponse, BatchScraperRequest
 from app.services.scraper import FacebookScraper
+from app.services.coordination import get_backend
+from app.services.worker import submit_job
+from app.services.profiling import get_profiler
+from app.utils.serialization import ndjson_line
+from app.utils.helpers import is_valid_admin_token
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["scraper"])
 
+# Maximum number of URLs accepted in one batch request
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", "50"))
+
 
 @router.post("/scrape", response_model=ScraperResponse)
-async def scrape_facebook_page(request: ScraperRequest):
+async def scrape_facebook_page(
+    request: ScraperRequest,
+    profile: bool = Query(False, description="Capture a CPU and allocation profile of this request"),
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+):
     """
     Scrape a Facebook page and extract relevant information.
     
     Args:
         request: The request containing the Facebook page URL to scrape
+        profile: Capture a profile of this request
+        x_profile: Same as ``profile``, set through the X-Profile header
+        x_admin_token: Admin token, required to request a profile if ADMIN_TOKEN is set
         
     Returns:
         ScraperResponse: The response containing the scraped data or error
+        
+    Raises:
+        HTTPException: If a profile is requested without a valid admin token,
+            or in distributed mode where pages are scraped by the workers
     """
+    profile_requested = profile or (x_profile or '').strip().lower() in ('1', 'true', 'yes')
+    if profile_requested:
+        if not is_valid_admin_token(x_admin_token):
+            raise HTTPException(status_code=403, detail="Invalid admin token")
+        if get_backend() is not None:
+            raise HTTPException(status_code=400, detail="Profiling is not available in distributed mode")
+    
     try:
         logger.info(f"Received request to scrape: {request.url}")
         
+        # In distributed mode the page is scraped by a worker
+        backend = get_backend()
+        if backend is not None:
+            return ScraperResponse(**await submit_job(backend, str(request.url), request.timeout))
+        
         scraper = FacebookScraper()
-        data = await scraper.scrape_page(str(request.url))
+        profiler = get_profiler()
+        if profiler.should_profile(profile_requested):
+            # Profile and save in the worker thread that does the scraping
+            def profiled_scrape():
+                with profiler.capture(str(request.url)) as capture:
+                    try:
+                        # Fetch in this thread so that the profile includes it
+                        return scraper.scrape_page_sync(str(request.url), request.timeout, threaded_fetch=False)
+                    finally:
+                        if capture is not None:
+                            capture.html = scraper.last_html
+            
+            data = await asyncio.to_thread(profiled_scrape)
+        else:
+            data = await scraper.scrape_page(str(request.url), request.timeout)
         
         logger.info(f"Successfully scraped page: {request.url}")
-        return ScraperResponse(success=True, data=data)
+        return ScraperResponse(success=True, data=data.to_schema())
     
     except Exception as e:
         logger.error(f"Error scraping page {request.url}: {str(e)}")
         return ScraperResponse(success=False, error=str(e))
 
 
+@router.post("/scrape/batch")
+async def scrape_facebook_pages(request: BatchScraperRequest):
+    """
+    Scrape several Facebook pages and stream the results as NDJSON.
+    
+    Each line has the same shape as a ScraperResponse. Results are encoded
+    straight from the internal result type, skipping pydantic validation.
+    
+    Args:
+        request: The request containing the Facebook page URLs to scrape
+        
+    Returns:
+        StreamingResponse: One JSON object per URL, in request order
+        
+    Raises:
+        HTTPException: If more than BATCH_MAX_URLS URLs are requested
+    """
+    if len(request.urls) > BATCH_MAX_URLS:
+        raise HTTPException(status_code=422, detail=f"At most {BATCH_MAX_URLS} URLs can be scraped per batch")
+    
+    logger.info(f"Received batch request to scrape {len(request.urls)} pages")
+    
+    async def generate():
+        backend = get_backend()
+        if backend is not None:
+            # Queue every page up front so that the batch is spread over all workers
+            pending = [
+                asyncio.ensure_future(_submit_job_safely(backend, str(url), request.timeout))
+                for url in request.urls
+            ]
+            try:
+                for task in pending:
+                    yield ndjson_line(await task)
+            finally:
+                for task in pending:
+                    task.cancel()
+            return
+        
+        scraper = FacebookScraper()
+        for url in request.urls:
+            try:
+                data = await scraper.scrape_page(str(url), request.timeout)
+                yield ndjson_line({"success": True, "data": data.to_dict(), "error": None})
+            except Exception as e:
+                logger.error(f"Error scraping page {url}: {str(e)}")
+                yield ndjson_line({"success": False, "data": None, "error": str(e)})
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+async def _submit_job_safely(backend, url: str, timeout: Optional[float]) -> dict:
+    """Submit a job to the workers, turning errors into a failed response."""
+    try:
+        return await submit_job(backend, url, timeout)
+    except Exception as e:
+        logger.error(f"Error submitting page {url}: {str(e)}")
+        return {"success": False, "data": None, "error": str(e)}
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -41,4 +150,4 @@ async def health_check():
     Returns:
         dict: A simple status message
     """
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lanes in priority order: interactive single-page requests are admitted before batch traffic
+LANE_INTERACTIVE = 'interactive'
+LANE_BATCH = 'batch'
+LANES = (LANE_INTERACTIVE, LANE_BATCH)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Limits the number of requests processed concurrently.
+
+    Requests beyond ``max_in_flight`` wait in a bounded queue for at most
+    ``queue_timeout`` seconds. Free slots go to the highest-priority lane first
+    and, within a lane, to the client with the fewest requests in flight.
+    Each client is also capped at its fair share of the total capacity.
+    """
+
+    def __init__(self, max_in_flight: int = 8, max_queue: int = 32,
+                 queue_timeout: float = 10.0, retry_after: int = 1):
+        """
+        Initialize the admission controller.
+
+        Args:
+            max_in_flight: Maximum number of requests processed at once
+            max_queue: Maximum number of requests waiting for a slot
+            queue_timeout: Seconds a request may wait before being rejected
+            retry_after: Value of the Retry-After header on rejections
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._in_flight_by_key: Dict[str, int] = {}
+        self._queued_by_key: Dict[str, int] = {}
+        self._waiters: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            lane: OrderedDict() for lane in LANES
+        }
+
+    @property
+    def queued(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return sum(self._queued_by_key.values())
+
+    def _fair_share(self, key: str) -> int:
+        """Return the maximum number of admitted plus queued requests for a key."""
+        active_keys = set(self._in_flight_by_key) | set(self._queued_by_key)
+        active_keys.add(key)
+        return max(1, (self.max_in_flight + self.max_queue) // len(active_keys))
+
+    def _grant(self, key: str) -> None:
+        self.in_flight += 1
+        self._in_flight_by_key[key] = self._in_flight_by_key.get(key, 0) + 1
+
+    def _dequeue(self, key: str) -> None:
+        self._queued_by_key[key] -= 1
+        if not self._queued_by_key[key]:
+            del self._queued_by_key[key]
+
+    def _next_waiter(self) -> Optional[tuple]:
+        """Pop the next waiter to admit, or return None if nobody is waiting."""
+        for lane in LANES:
+            queues = self._waiters[lane]
+            while queues:
+                key = min(queues, key=lambda k: self._in_flight_by_key.get(k, 0))
+                waiter = queues[key].popleft()
+                if not queues[key]:
+                    del queues[key]
+                else:
+                    # Rotate so keys with equal load are served round-robin
+                    queues.move_to_end(key)
+                if not waiter.done():
+                    return key, waiter
+        return None
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting requests."""
+        while self.in_flight < self.max_in_flight:
+            next_waiter = self._next_waiter()
+            if next_waiter is None:
+                return
+            key, waiter = next_waiter
+            self._dequeue(key)
+            self._grant(key)
+            waiter.set_result(None)
+
+    async def acquire(self, key: str, lane: str = LANE_INTERACTIVE) -> None:
+        """
+        Wait for a processing slot.
+
+        Args:
+            key: Identifier used for fair sharing (API key or client address)
+            lane: Priority lane of the request
+
+        Raises:
+            AdmissionRejected: If the request is over its fair share, the
+                queue is full or the wait deadline passes
+        """
+        if self.in_flight < self.max_in_flight and not self.queued:
+            self._grant(key)
+            return
+
+        held = self._in_flight_by_key.get(key, 0) + self._queued_by_key.get(key, 0)
+        if held >= self._fair_share(key):
+            raise AdmissionRejected(429, "Too many concurrent requests for this client", self.retry_after)
+        if self.queued >= self.max_queue:
+            raise AdmissionRejected(503, "Server is at capacity", self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[lane].setdefault(key, deque()).append(waiter)
+        self._queued_by_key[key] = self._queued_by_key.get(key, 0) + 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted while we were giving up, hand it back
+                self.release(key)
+            else:
+                waiter.cancel()
+                self._dequeue(key)
+            if isinstance(e, asyncio.TimeoutError):
+                raise AdmissionRejected(503, "Timed out waiting for capacity", self.retry_after)
+            raise
+
+    def release(self, key: str) -> None:
+        """
+        Release a slot obtained with ``acquire`` and admit the next waiter.
+
+        Args:
+            key: The key passed to ``acquire``
+        """
+        self.in_flight -= 1
+        self._in_flight_by_key[key] -= 1
+        if not self._in_flight_by_key[key]:
+            del self._in_flight_by_key[key]
+        self._dispatch()
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to scrape requests.
+
+    The slot is held until the response has been fully sent, so streamed
+    batch responses count against the limit for their whole duration.
+
+    Fair share is keyed on the ``X-API-Key`` header only when it is one of
+    the configured ``api_keys``. Otherwise the client address is used, so
+    that clients cannot escape their share by sending made-up keys.
+    """
+
+    def __init__(self, app, controller: AdmissionController, path_prefix: str = '/api/scrape',
+                 api_keys: Optional[Iterable[str]] = None):
+        self.app = app
+        self.controller = controller
+        self.path_prefix = path_prefix
+        self.api_keys = frozenset(api_keys or ())
+
+    def _fair_share_key(self, scope) -> str:
+        """Return the identity a request is accounted to."""
+        headers = dict(scope.get('headers') or [])
+        api_key = headers.get(b'x-api-key', b'').decode('latin-1')
+        if api_key and api_key in self.api_keys:
+            return 'key:' + api_key
+        client = scope.get('client')
+        return 'addr:' + (client[0] if client else 'anonymous')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not scope['path'].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        client_key = self._fair_share_key(scope)
+        lane = LANE_BATCH if scope['path'].rstrip('/').endswith('/batch') else LANE_INTERACTIVE
+
+        try:
+            await self.controller.acquire(client_key, lane)
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected {lane} request from {client_key}: {e.reason}")
+            await self._reject(send, e)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(client_key)
+
+    async def _reject(self, send, rejection: AdmissionRejected) -> None:
+        body = json.dumps({"success": False, "data": None, "error": rejection.reason}).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': rejection.status_code,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('latin-1')),
+                (b'retry-after', str(rejection.retry_after).encode('latin-1')),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
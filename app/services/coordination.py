@@ -0,0 +1,258 @@
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+import logging
+import math
+import os
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.utils.serialization import dumps
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is only needed in distributed mode
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CoordinationBackend(ABC):
+    """
+    Shared state used by scraper workers running on several hosts.
+
+    Provides a work queue, a result cache, locks to avoid scraping the same
+    page twice at once, fixed-window counters for the global rate budget and
+    a channel to hand results back to whoever submitted the job.
+    """
+
+    @abstractmethod
+    async def push_job(self, job: Dict[str, Any]) -> None:
+        """Add a job to the shared work queue."""
+
+    @abstractmethod
+    async def pop_job(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Take the next job from the queue, or return None after ``timeout`` seconds."""
+
+    @abstractmethod
+    async def get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached value, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set_cached(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        """Cache a value for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        """
+        Take a lock that expires after ``ttl`` seconds.
+
+        Returns the owner token needed to release it, or None if it is already held.
+        """
+
+    @abstractmethod
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock taken with ``try_lock``, unless it has expired and been taken by someone else."""
+
+    @abstractmethod
+    async def incr_window(self, key: str, ttl: float) -> int:
+        """Increment a counter that expires after ``ttl`` seconds and return its new value."""
+
+    @abstractmethod
+    async def set_result(self, job_id: str, value: Dict[str, Any], ttl: float) -> None:
+        """Publish the result of a job."""
+
+    @abstractmethod
+    async def wait_result(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the result of a job, or return None after ``timeout`` seconds."""
+
+
+class InMemoryBackend(CoordinationBackend):
+    """
+    In-process backend with the same semantics as the Redis backend.
+
+    Only shares state between workers in the same event loop, so it is meant
+    for tests and single-host development.
+    """
+
+    def __init__(self):
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._values: Dict[str, Tuple[Any, float]] = {}
+        self._results: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._changed = asyncio.Condition()
+
+    def _get(self, key: str) -> Any:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._values[key]
+            return None
+        return value
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        self._values[key] = (value, time.monotonic() + ttl)
+
+    async def _wait_for(self, predicate, timeout: float) -> bool:
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(predicate), timeout=timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def push_job(self, job: Dict[str, Any]) -> None:
+        self._queue.append(json.loads(dumps(job)))
+        await self._notify()
+
+    async def pop_job(self, timeout: float) -> Optional[Dict[str, Any]]:
+        if not await self._wait_for(lambda: bool(self._queue), timeout):
+            return None
+        return self._queue.popleft()
+
+    async def get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._get(key)
+
+    async def set_cached(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self._set(key, value, ttl)
+
+    async def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        if self._get(key) is not None:
+            return None
+        token = uuid.uuid4().hex
+        self._set(key, token, ttl)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if self._get(key) == token:
+            del self._values[key]
+
+    async def incr_window(self, key: str, ttl: float) -> int:
+        count = (self._get(key) or 0) + 1
+        if count == 1:
+            self._set(key, count, ttl)
+        else:
+            # Keep the original expiry, like INCR on an existing Redis key
+            self._values[key] = (count, self._values[key][1])
+        return count
+
+    async def set_result(self, job_id: str, value: Dict[str, Any], ttl: float) -> None:
+        self._results.setdefault(job_id, deque()).append(value)
+        await self._notify()
+
+    async def wait_result(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        if not await self._wait_for(lambda: bool(self._results.get(job_id)), timeout):
+            return None
+        results = self._results[job_id]
+        value = results.popleft()
+        if not results:
+            del self._results[job_id]
+        return value
+
+
+# Deletes a lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackend(CoordinationBackend):
+    """
+    Backend storing shared state in Redis or a Redis-compatible server.
+
+    Requires the ``redis`` package.
+    """
+
+    def __init__(self, url: str, prefix: str = 'fbscraper:'):
+        """
+        Connect to a Redis server.
+
+        Args:
+            url: Redis connection URL, e.g. ``redis://localhost:6379/0``
+            prefix: Prefix added to every key
+        """
+        if aioredis is None:
+            raise ImportError("The redis package is required for the Redis coordination backend")
+        self.client = aioredis.from_url(url)
+        self.prefix = prefix
+        self._release_lock_script = self.client.register_script(RELEASE_LOCK_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    @staticmethod
+    def _seconds(value: float) -> int:
+        # Redis expiries and blocking timeouts are whole seconds, 0 meaning forever
+        return max(1, math.ceil(value))
+
+    async def push_job(self, job: Dict[str, Any]) -> None:
+        await self.client.lpush(self._key('queue'), dumps(job))
+
+    async def pop_job(self, timeout: float) -> Optional[Dict[str, Any]]:
+        # BRPOP removes the job before it is processed: if the worker dies
+        # meanwhile the job is lost and its submitter times out waiting.
+        item = await self.client.brpop(self._key('queue'), timeout=self._seconds(timeout))
+        return json.loads(item[1]) if item else None
+
+    async def get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.client.get(self._key(key))
+        return json.loads(value) if value is not None else None
+
+    async def set_cached(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        await self.client.set(self._key(key), dumps(value), ex=self._seconds(ttl))
+
+    async def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if await self.client.set(self._key(key), token, nx=True, ex=self._seconds(ttl)):
+            return token
+        return None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self._release_lock_script(keys=[self._key(key)], args=[token])
+
+    async def incr_window(self, key: str, ttl: float) -> int:
+        count = await self.client.incr(self._key(key))
+        if count == 1:
+            await self.client.expire(self._key(key), self._seconds(ttl))
+        return count
+
+    async def set_result(self, job_id: str, value: Dict[str, Any], ttl: float) -> None:
+        key = self._key(f'result:{job_id}')
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, dumps(value))
+            pipe.expire(key, self._seconds(ttl))
+            await pipe.execute()
+
+    async def wait_result(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        item = await self.client.blpop(self._key(f'result:{job_id}'), timeout=self._seconds(timeout))
+        return json.loads(item[1]) if item else None
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> Optional[CoordinationBackend]:
+    """
+    Return the coordination backend configured through the environment.
+
+    ``COORDINATION_URL`` selects the backend: a ``redis://`` or ``rediss://``
+    URL for Redis, or ``memory://`` for the in-process backend. Returns None
+    when it is unset, in which case pages are scraped locally.
+    """
+    url = os.getenv("COORDINATION_URL")
+    if not url:
+        return None
+    if url.startswith('memory://'):
+        logger.info("Using in-memory coordination backend")
+        return InMemoryBackend()
+    logger.info("Using Redis coordination backend")
+    return RedisBackend(url)
@@ -0,0 +1,211 @@
+import cProfile
+import io
+import itertools
+import json
+import logging
+import os
+import pstats
+import re
+import shutil
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Capture directories are named after the capture id, e.g. 20240101120000-1a2b3c4d
+CAPTURE_ID_PATTERN = re.compile(r'^\d{14}-[0-9a-f]{8}$')
+
+# Allocations are only reported for code in the app package
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stack depth recorded by tracemalloc, deep enough to reach app code from library allocations
+TRACEMALLOC_FRAMES = 25
+
+
+class ProfileCapture:
+    """A CPU and allocation profile of a single scrape."""
+
+    __slots__ = ('id', 'url', 'captured_at', 'duration', 'peak_memory', 'directory', 'html')
+
+    def __init__(self, url: str, profile_dir: str):
+        self.id = datetime.now().strftime('%Y%m%d%H%M%S') + '-' + uuid.uuid4().hex[:8]
+        self.url = url
+        self.captured_at = datetime.now().isoformat()
+        self.duration = 0.0
+        # Peak traced memory of the whole process during the capture
+        self.peak_memory = 0
+        self.directory = os.path.join(profile_dir, self.id)
+        # Set by the caller to the fetched HTML so the run can be reproduced
+        self.html: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the capture metadata as a plain dict."""
+        return {
+            "id": self.id,
+            "url": self.url,
+            "captured_at": self.captured_at,
+            "duration": self.duration,
+            "peak_memory": self.peak_memory,
+            "directory": self.directory,
+        }
+
+
+class Profiler:
+    """
+    Captures cProfile and tracemalloc profiles of selected scrape requests.
+
+    A request is profiled when explicitly asked for, or as 1 in
+    ``sample_rate`` requests. Each capture is written to its own directory
+    with the raw profile, a text summary, the allocation summary and the
+    triggering HTML. Only the ``max_recent`` newest capture directories are
+    kept. Only one capture runs at a time since tracemalloc is process-wide;
+    requests arriving meanwhile are not profiled. For the same reason the
+    peak memory includes allocations made by other requests during the
+    capture, while the allocation summary only lists app code.
+    """
+
+    def __init__(self, directory: str = 'profiles', sample_rate: int = 0, max_recent: int = 100):
+        """
+        Initialize the profiler.
+
+        Args:
+            directory: Directory where captures are saved
+            sample_rate: Profile 1 in N requests, 0 to only profile on demand
+            max_recent: Number of recent captures kept on disk and for listing
+        """
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_recent = max_recent
+        self.recent = deque(maxlen=max_recent)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def should_profile(self, requested: bool = False) -> bool:
+        """
+        Decide whether to profile the current request.
+
+        Args:
+            requested: True if the client asked for a profile
+
+        Returns:
+            bool: True if the request should be profiled
+        """
+        if self._lock.locked():
+            return False
+        if requested:
+            return True
+        return self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+
+    @contextmanager
+    def capture(self, url: str):
+        """
+        Profile the enclosed block and save the result.
+
+        Only profiles the calling thread, and saves the files synchronously,
+        so run it in the thread doing the work rather than on the event loop.
+
+        Args:
+            url: The URL being scraped
+
+        Yields:
+            ProfileCapture: The capture, whose ``html`` should be set by the
+                caller, or None if another capture is already running
+        """
+        if not self._lock.acquire(blocking=False):
+            yield None
+            return
+
+        capture = ProfileCapture(url, self.directory)
+        profile = cProfile.Profile()
+        tracing = tracemalloc.is_tracing()
+
+        if tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield capture
+        finally:
+            profile.disable()
+            capture.duration = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(True, os.path.join(APP_DIR, '*'), all_frames=True),
+            ])
+            capture.peak_memory = tracemalloc.get_traced_memory()[1]
+            if not tracing:
+                tracemalloc.stop()
+            self._lock.release()
+
+            try:
+                self._save(capture, profile, snapshot)
+                self.recent.append(capture.to_dict())
+                self._prune()
+            except OSError as e:
+                logger.error(f"Error saving profile for {url}: {e}")
+
+    def _save(self, capture: ProfileCapture, profile: cProfile.Profile,
+              snapshot: tracemalloc.Snapshot) -> None:
+        os.makedirs(capture.directory, exist_ok=True)
+
+        profile.dump_stats(os.path.join(capture.directory, 'profile.prof'))
+
+        stats_output = io.StringIO()
+        pstats.Stats(profile, stream=stats_output).sort_stats('cumulative').print_stats(40)
+        with open(os.path.join(capture.directory, 'profile.txt'), 'w', encoding='utf-8') as f:
+            f.write(stats_output.getvalue())
+
+        with open(os.path.join(capture.directory, 'allocations.txt'), 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics('lineno')[:40]:
+                f.write(f"{stat}\n")
+
+        if capture.html is not None:
+            with open(os.path.join(capture.directory, 'page.html'), 'w', encoding='utf-8') as f:
+                f.write(capture.html)
+
+        with open(os.path.join(capture.directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(capture.to_dict(), f, indent=2)
+
+        logger.info(f"Saved profile {capture.id} for {capture.url} ({capture.duration:.3f}s)")
+
+    def _prune(self) -> None:
+        """Delete the oldest capture directories beyond ``max_recent``, leaving anything else alone."""
+        entries = [entry for entry in os.scandir(self.directory)
+                   if entry.is_dir() and CAPTURE_ID_PATTERN.match(entry.name)]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[self.max_recent:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def slowest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the slowest recent captures.
+
+        Args:
+            limit: Maximum number of captures to return
+
+        Returns:
+            list: Capture metadata, slowest first
+        """
+        return sorted(self.recent, key=lambda c: c["duration"], reverse=True)[:limit]
+
+
+@lru_cache(maxsize=None)
+def get_profiler() -> Profiler:
+    """
+    Return the profiler configured through the environment.
+
+    ``PROFILE_DIR`` sets where captures are saved and ``PROFILE_SAMPLE_RATE``
+    profiles 1 in N requests (0, the default, only profiles on demand).
+    """
+    return Profiler(
+        directory=os.getenv("PROFILE_DIR", "profiles"),
+        sample_rate=int(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+    )
@@ -1,13 +1,19 @@
+import asyncio
 import requests
 import re
 import json
 import logging
+import os
 import random
+import threading
+import urllib3
 from datetime import datetime
+from typing import Optional, Tuple
 from bs4 import BeautifulSoup
-from app.models.schemas import FacebookPageData
+from app.models.result import PageResult
 from app.utils.helpers import extract_emails_from_text, is_valid_facebook_url, clean_text, is_valid_email
 from app.utils.parser import FacebookParser
+from app.utils.deadline import Deadline, is_expired
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +30,15 @@ USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59',
 ]
 
+# Default and maximum deadline in seconds for fetching and parsing a page
+DEFAULT_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", "30"))
+
+# Share of the deadline available to the fetch; the rest is kept for parsing
+FETCH_BUDGET_SHARE = 0.8
+
+# Maximum size of the chunks read from the response body
+READ_CHUNK_SIZE = 64 * 1024
+
 
 class FacebookScraper:
     """
@@ -48,20 +63,50 @@ class FacebookScraper:
             'Sec-Fetch-User': '?1',
         })
         self.parser = FacebookParser()
+        # HTML of the last fetched page, kept for profiling captures
+        self.last_html = None
         
-    async def scrape_page(self, url: str) -> FacebookPageData:
+    async def scrape_page(self, url: str, timeout: Optional[float] = None) -> PageResult:
+        """
+        Scrape a Facebook page without blocking the event loop.
+        
+        Runs ``scrape_page_sync`` in a worker thread.
+        
+        Args:
+            url: The URL of the Facebook page to scrape
+            timeout: Deadline in seconds, defaults to and is capped at DEFAULT_DEADLINE
+            
+        Returns:
+            PageResult: The extracted data from the Facebook page
+            
+        Raises:
+            Exception: If there's an error during scraping
+        """
+        return await asyncio.to_thread(self.scrape_page_sync, url, timeout)
+    
+    def scrape_page_sync(self, url: str, timeout: Optional[float] = None,
+                         threaded_fetch: bool = True) -> PageResult:
         """
         Scrape a Facebook page and extract email and basic information.
         
+        Blocks until done, so call it from a worker thread or use ``scrape_page``.
+        The whole run (connect, read, parse and the direct extraction
+        fallbacks) is bounded by a deadline. When it is hit, the data found
+        so far is returned with ``incomplete`` set.
+        
         Args:
             url: The URL of the Facebook page to scrape
+            timeout: Deadline in seconds, defaults to and is capped at DEFAULT_DEADLINE
+            threaded_fetch: Download in a separate thread, see ``_fetch``
             
         Returns:
-            FacebookPageData: The extracted data from the Facebook page
+            PageResult: The extracted data from the Facebook page
             
         Raises:
             Exception: If there's an error during scraping
         """
+        deadline = Deadline(min(timeout or DEFAULT_DEADLINE, DEFAULT_DEADLINE))
+        
         try:
             # Validate the URL
             if not is_valid_facebook_url(url):
@@ -74,21 +119,29 @@ class FacebookScraper:
             
             # Make the request
             logger.info(f"Making request to: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            fetch_deadline = Deadline(deadline.remaining() * FETCH_BUDGET_SHARE)
+            try:
+                content, html_content, truncated = self._fetch(url, fetch_deadline, threaded_fetch)
+                self.last_html = html_content
+            except requests.Timeout as e:
+                if not fetch_deadline.expired():
+                    raise
+                logger.warning(f"Deadline hit while fetching {url}: {e}")
+                return self._incomplete_result(url)
             
             # Parse the content
-            soup = BeautifulSoup(response.content, 'lxml')
-            html_content = response.text
+            soup = BeautifulSoup(content, 'lxml')
             
             # Extract data using the parser
-            data = self.parser.parse_page(soup, url)
+            data = self.parser.parse_page(soup, url, deadline)
+            data.incomplete = data.incomplete or truncated
             
             # If the parser didn't find an email, try direct extraction methods
-            if not data.email:
-                emails = self._extract_emails_directly(soup, html_content)
+            if not data.email and not data.incomplete:
+                emails, skipped = self._extract_emails_with_status(soup, html_content, deadline)
                 if emails:
                     data.email = emails[0]
+                data.incomplete = skipped
             
             return data
             
@@ -100,7 +153,106 @@ class FacebookScraper:
             logger.error(f"Scraping error: {e}")
             raise Exception(f"Error during page scraping: {e}")
     
-    def _extract_emails_directly(self, soup: BeautifulSoup, html_content: str) -> list:
+    def _fetch(self, url: str, deadline: Deadline, threaded: bool = True) -> tuple:
+        """
+        Download a page, stopping when the deadline is reached.
+        
+        The request runs in a separate thread so that the deadline is a
+        wall-clock limit: a server trickling bytes cannot hold the scrape past
+        it. If the deadline passes mid-body, the bytes read so far are returned.
+        The thread also checks the deadline itself and closes the response
+        once it passes, so it does not outlive the scrape by more than one read.
+        
+        With ``threaded`` off the request runs in the calling thread, so that
+        a profiler enabled there sees it. The deadline is then only checked
+        between reads.
+        
+        Args:
+            url: The URL to fetch
+            deadline: Deadline bounding the connect and the whole body read
+            threaded: Run the request in a separate thread
+            
+        Returns:
+            tuple: Raw body bytes, decoded text and whether the body was cut short
+            
+        Raises:
+            requests.RequestException: If the request fails, or requests.Timeout
+                if the deadline passes before the response headers arrive
+        """
+        remaining = deadline.remaining()
+        if not remaining:
+            raise requests.Timeout("Deadline expired before the request was sent")
+        
+        chunks = []
+        state = {'response': None, 'error': None, 'truncated': False}
+        
+        def read():
+            try:
+                response = self.session.get(url, timeout=(remaining, remaining), stream=True)
+                state['response'] = response
+                try:
+                    # Stop as soon as the deadline passes, even if nobody waits for us any more
+                    if deadline.expired():
+                        state['truncated'] = True
+                        return
+                    response.raise_for_status()
+                    if hasattr(response.raw, 'read1'):
+                        # Return whatever has arrived instead of waiting for a full chunk
+                        body = iter(lambda: response.raw.read1(READ_CHUNK_SIZE, decode_content=True), b'')
+                    else:
+                        body = response.iter_content(chunk_size=READ_CHUNK_SIZE)
+                    try:
+                        for chunk in body:
+                            chunks.append(chunk)
+                            if deadline.expired():
+                                state['truncated'] = True
+                                return
+                    except urllib3.exceptions.ReadTimeoutError as e:
+                        raise requests.ReadTimeout(e)
+                    except (urllib3.exceptions.HTTPError, OSError) as e:
+                        raise requests.ConnectionError(e)
+                finally:
+                    response.close()
+            except Exception as e:
+                state['error'] = e
+        
+        if threaded:
+            reader = threading.Thread(target=read, name='scraper-fetch', daemon=True)
+            reader.start()
+            reader.join(deadline.remaining())
+            reading = reader.is_alive()
+        else:
+            read()
+            reading = False
+        
+        response = state['response']
+        truncated = reading or state['truncated']
+        if reading and response is None:
+            # The reader closes the response itself once the headers arrive
+            raise requests.Timeout("Deadline expired before the page responded")
+        if truncated:
+            logger.warning(f"Deadline hit while reading {url}, parsing partial body")
+        elif state['error'] is not None:
+            # A read that failed because the deadline passed still has a usable partial body
+            if not (response is not None and response.ok and chunks and deadline.expired()):
+                raise state['error']
+            logger.warning(f"Deadline hit while reading {url}, parsing partial body")
+            truncated = True
+        
+        content = b''.join(list(chunks))
+        html_content = content.decode(response.encoding or 'utf-8', errors='replace')
+        return content, html_content, truncated
+    
+    def _incomplete_result(self, url: str) -> PageResult:
+        """Return an empty result for a page that could not be fetched in time."""
+        return PageResult(
+            page_url=url,
+            scraped_date=datetime.now().isoformat(),
+            incomplete=True
+        )
+    
+    def _extract_emails_directly(self, soup: BeautifulSoup, html_content: str,
+                                 deadline: Optional[Deadline] = None) -> list:
         """
         Extract emails directly from the HTML content using multiple methods.
         This is a fallback if the parser doesn't find an email.
@@ -108,15 +260,32 @@ class FacebookScraper:
         Args:
             soup: BeautifulSoup object containing the parsed HTML
             html_content: Raw HTML content as string
+            deadline: Optional deadline; remaining methods are skipped once it passes
             
         Returns:
             list: List of extracted email addresses
         """
+        return self._extract_emails_with_status(soup, html_content, deadline)[0]
+    
+    def _extract_emails_with_status(self, soup: BeautifulSoup, html_content: str,
+                                    deadline: Optional[Deadline] = None) -> Tuple[list, bool]:
+        """
+        Same as ``_extract_emails_directly``, also reporting skipped methods.
+        
+        Returns:
+            tuple: List of extracted email addresses and whether a method that
+                would have run was skipped because the deadline had passed
+        """
         emails = []
+        skipped = False
         
         # Method 1: Direct regex search in HTML (including unicode encoding)
         email_pattern = r'([a-zA-Z0-9_.+-]+)\\u0040([a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)|([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)'
-        email_matches = re.findall(email_pattern, html_content)
+        if is_expired(deadline):
+            skipped = True
+            email_matches = []
+        else:
+            email_matches = re.findall(email_pattern, html_content)
         
         for match in email_matches:
             if match[0] and match[1]:  # Unicode format: user\u0040domain.com
@@ -129,8 +298,15 @@ class FacebookScraper:
                 logger.info(f"Found email using direct regex: {email}")
         
         # Method 2: Extract from JSON data in script tags
-        script_tags = soup.select('script[type="application/json"]')
+        if is_expired(deadline):
+            skipped = True
+            script_tags = []
+        else:
+            script_tags = soup.select('script[type="application/json"]')
         for script in script_tags:
+            if is_expired(deadline):
+                skipped = True
+                break
             script_content = script.text
             if script_content and ('profile_email' in script_content):
                 try:
@@ -180,7 +356,9 @@ class FacebookScraper:
                     logger.error(f"Error parsing JSON from script tag: {e}")
         
         # Method 3: Look for mailto links
-        if not emails:
+        if not emails and is_expired(deadline):
+            skipped = True
+        elif not emails:
             email_links = soup.select('a[href^="mailto:"]')
             for link in email_links:
                 href = link.get('href', '')
@@ -191,7 +369,9 @@ class FacebookScraper:
                         logger.info(f"Found email using mailto link: {email}")
         
         # Method 4: Look for email text in specific sections
-        if not emails:
+        if not emails and is_expired(deadline):
+            skipped = True
+        elif not emails:
             contact_sections = soup.select('div:contains("Contact Info"), div:contains("Email"), div:contains("Contact")')
             for section in contact_sections:
                 section_text = ' '.join(text for text in section.stripped_strings)
@@ -201,14 +381,19 @@ class FacebookScraper:
                     logger.info(f"Found emails in contact section: {found_emails}")
         
         # Method 5: Look for emails in the entire page as a fallback
-        if not emails:
+        if not emails and is_expired(deadline):
+            skipped = True
+        elif not emails:
             body_text = ' '.join(text for text in soup.body.stripped_strings) if soup.body else ''
             found_emails = extract_emails_from_text(body_text)
             if found_emails:
                 emails.extend(found_emails)
                 logger.info(f"Found emails in page body: {found_emails}")
         
+        if skipped:
+            logger.warning("Deadline hit during direct email extraction")
+        
         # Remove duplicates and clean up
         emails = list(dict.fromkeys([email.lower() for email in emails]))
         
-        return emails
\ No newline at end of file
+        return emails, skipped
\ No newline at end of file
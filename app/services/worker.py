@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from app.services.coordination import CoordinationBackend
+from app.services.scraper import FacebookScraper, DEFAULT_DEADLINE
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of requests per second sent to a single host, across all workers
+HOST_RATE_LIMIT = int(os.getenv("WORKER_HOST_RATE_LIMIT", "2"))
+
+# Seconds a scraped page stays in the shared cache
+CACHE_TTL = float(os.getenv("WORKER_CACHE_TTL", "3600"))
+
+# Extra seconds a submitter waits for a result on top of the job deadline
+RESULT_WAIT_SLACK = float(os.getenv("WORKER_RESULT_WAIT_SLACK", "30"))
+
+
+def cache_key(url: str) -> str:
+    """Return the shared cache key for a page URL."""
+    return 'page:' + url.rstrip('/').lower()
+
+
+async def submit_job(backend: CoordinationBackend, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Queue a page for scraping by the workers and wait for the result.
+
+    Args:
+        backend: The coordination backend shared with the workers
+        url: The URL of the Facebook page to scrape
+        timeout: Deadline in seconds for the scrape itself
+
+    Returns:
+        dict: A response with the same shape as ScraperResponse
+    """
+    cached = await backend.get_cached(cache_key(url))
+    if cached is not None:
+        return {"success": True, "data": cached, "error": None}
+
+    job_id = uuid.uuid4().hex
+    wait = (timeout or DEFAULT_DEADLINE) + RESULT_WAIT_SLACK
+    # Workers drop the job once nobody is waiting for its result any more
+    await backend.push_job({"id": job_id, "url": url, "timeout": timeout, "expires_at": time.time() + wait})
+
+    result = await backend.wait_result(job_id, wait)
+    if result is None:
+        return {"success": False, "data": None, "error": "Timed out waiting for a worker"}
+    return result
+
+
+def start_local_workers(backend: CoordinationBackend, count: int) -> List[asyncio.Task]:
+    """
+    Run scrape workers as tasks in the current event loop.
+
+    Used with the in-memory backend, whose queue cannot be read by another process.
+
+    Args:
+        backend: The coordination backend to take jobs from
+        count: Number of workers to start
+
+    Returns:
+        list: The worker tasks, to be cancelled on shutdown
+    """
+    return [asyncio.ensure_future(ScrapeWorker(backend).run()) for _ in range(count)]
+
+
+class ScrapeWorker:
+    """
+    Worker that scrapes pages taken from a shared queue.
+
+    Workers on any number of hosts can share one backend. They reuse each
+    other's cached results, avoid scraping the same page concurrently and
+    together stay within a global per-host request rate.
+    """
+
+    def __init__(self, backend: CoordinationBackend, scraper: Optional[FacebookScraper] = None,
+                 host_rate_limit: int = HOST_RATE_LIMIT, cache_ttl: float = CACHE_TTL,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the worker.
+
+        Args:
+            backend: The coordination backend shared between workers
+            scraper: Scraper used to fetch pages, a new one by default
+            host_rate_limit: Maximum requests per second to a host, across all workers
+            cache_ttl: Seconds a scraped page stays in the shared cache
+            clock: Wall-clock time source used for the rate windows and job expiry
+        """
+        self.backend = backend
+        self.scraper = scraper or FacebookScraper()
+        self.host_rate_limit = host_rate_limit
+        self.cache_ttl = cache_ttl
+        self.clock = clock
+
+    async def acquire_rate_budget(self, host: str) -> None:
+        """
+        Wait until a request to the host fits in the global rate budget.
+
+        Uses one-second fixed windows counted in the shared backend.
+
+        Args:
+            host: The host about to be requested
+        """
+        while True:
+            now = self.clock()
+            window = int(now)
+            count = await self.backend.incr_window(f'rate:{host}:{window}', ttl=2)
+            if count <= self.host_rate_limit:
+                return
+            await asyncio.sleep(window + 1 - now)
+
+    async def process(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Scrape the page of a job, using the shared cache when possible.
+
+        Args:
+            job: The job taken from the queue
+
+        Returns:
+            dict: A response with the same shape as ScraperResponse
+        """
+        url = job["url"]
+        timeout = job.get("timeout")
+        key = cache_key(url)
+        lock_key = 'lock:' + key
+        lock_ttl = (timeout or DEFAULT_DEADLINE) + 5
+
+        # Wait for another worker already scraping the same page
+        while True:
+            token = await self.backend.try_lock(lock_key, lock_ttl)
+            if token is not None:
+                break
+            cached = await self.backend.get_cached(key)
+            if cached is not None:
+                return {"success": True, "data": cached, "error": None}
+            await asyncio.sleep(0.1)
+
+        try:
+            cached = await self.backend.get_cached(key)
+            if cached is not None:
+                return {"success": True, "data": cached, "error": None}
+
+            await self.acquire_rate_budget(urlparse(url).netloc)
+            data = await self.scraper.scrape_page(url, timeout)
+            page = data.to_dict()
+            if not data.incomplete:
+                await self.backend.set_cached(key, page, self.cache_ttl)
+            return {"success": True, "data": page, "error": None}
+
+        except Exception as e:
+            logger.error(f"Error scraping page {url}: {str(e)}")
+            return {"success": False, "data": None, "error": str(e)}
+
+        finally:
+            await self.backend.release_lock(lock_key, token)
+
+    async def run_once(self, timeout: float = 1.0) -> bool:
+        """
+        Process a single job from the queue.
+
+        Jobs whose submitter has already given up waiting are dropped
+        without being scraped.
+
+        Args:
+            timeout: Seconds to wait for a job
+
+        Returns:
+            bool: True if a job was taken, False if the queue stayed empty
+        """
+        job = await self.backend.pop_job(timeout)
+        if job is None:
+            return False
+
+        expires_at = job.get("expires_at")
+        if expires_at is not None and self.clock() >= expires_at:
+            logger.info(f"Dropping expired job {job['id']}: {job['url']}")
+            return True
+
+        logger.info(f"Processing job {job['id']}: {job['url']}")
+        result = await self.process(job)
+        await self.backend.set_result(job["id"], result, ttl=RESULT_WAIT_SLACK)
+        return True
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Process jobs until ``stop`` is set.
+
+        Args:
+            stop: Event that ends the loop, runs forever if omitted
+        """
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Worker error: {e}")
+                await asyncio.sleep(1)
@@ -0,0 +1,41 @@
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    A point in time by which a unit of work must finish.
+
+    Based on the monotonic clock so it is unaffected by system time changes.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Start a deadline that expires after the given number of seconds.
+
+        Args:
+            seconds: Time budget in seconds
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Return the number of seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Return True if the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+
+
+def is_expired(deadline: Optional[Deadline]) -> bool:
+    """
+    Check an optional deadline.
+
+    Args:
+        deadline: The deadline to check, or None for no limit
+
+    Returns:
+        bool: True if a deadline was given and it has passed
+    """
+    return deadline is not None and deadline.expired()
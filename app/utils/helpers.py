@@ -1,4 +1,5 @@
 import re
+import os
 from urllib.parse import urlparse
 import logging
 
@@ -36,6 +37,20 @@ def is_valid_facebook_url(url):
     return parsed.netloc in ('www.facebook.com', 'facebook.com', 'm.facebook.com', 'web.facebook.com')
 
 
+def is_valid_admin_token(token):
+    """
+    Check a token against the ADMIN_TOKEN environment variable.
+    
+    Args:
+        token: The token sent by the client
+        
+    Returns:
+        bool: True if ADMIN_TOKEN is unset or matches the token, False otherwise
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    return not expected or token == expected
+
+
 def clean_text(text):
     """
     Clean text by removing extra whitespace and normalizing it.
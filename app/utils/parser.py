@@ -1,7 +1,8 @@
 from bs4 import BeautifulSoup
 import re
 import logging
-from app.models.schemas import FacebookPageData
+from app.models.result import PageResult
+from app.utils.deadline import Deadline, is_expired
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -13,37 +14,39 @@ class FacebookParser:
     Parser for extracting structured data from Facebook pages.
     """
     
-    def parse_page(self, soup: BeautifulSoup, url: str) -> FacebookPageData:
+    def parse_page(self, soup: BeautifulSoup, url: str, deadline: Optional[Deadline] = None) -> PageResult:
         """
         Extract structured data from a Facebook page.
         
         Args:
             soup: BeautifulSoup object containing the parsed HTML
             url: The URL of the Facebook page
+            deadline: Optional deadline, checked before each extraction step
             
         Returns:
-            FacebookPageData: Structured data extracted from the page
+            PageResult: Structured data extracted from the page, flagged as
+                incomplete if the deadline was hit
         """
-        data = FacebookPageData(
+        data = PageResult(
             page_url=url,
             scraped_date=datetime.now().isoformat()
         )
         
+        extractors = [
+            self._extract_page_name,
+            self._extract_email,
+            self._extract_phone,
+            self._extract_website,
+            self._extract_address,
+        ]
+        
         try:
-            # Extract page name
-            self._extract_page_name(soup, data)
-            
-            # Extract email addresses
-            self._extract_email(soup, data)
-            
-            # Extract phone numbers
-            self._extract_phone(soup, data)
-            
-            # Extract website
-            self._extract_website(soup, data)
-            
-            # Extract address
-            self._extract_address(soup, data)
+            for extract in extractors:
+                if is_expired(deadline):
+                    logger.warning(f"Deadline hit while parsing {url}, returning partial data")
+                    data.incomplete = True
+                    break
+                extract(soup, data)
             
             return data
             
@@ -51,7 +54,7 @@ class FacebookParser:
             logger.error(f"Error parsing Facebook page: {e}")
             return data
     
-    def _extract_page_name(self, soup: BeautifulSoup, data: FacebookPageData) -> None:
+    def _extract_page_name(self, soup: BeautifulSoup, data: PageResult) -> None:
         """Extract the page name."""
         try:
             # Try to find the page name in the title
@@ -69,7 +72,7 @@ class FacebookParser:
         except Exception as e:
             logger.error(f"Error extracting page name: {e}")
     
-    def _extract_email(self, soup: BeautifulSoup, data: FacebookPageData) -> None:
+    def _extract_email(self, soup: BeautifulSoup, data: PageResult) -> None:
         """Extract email addresses from the page."""
         try:
             # Method 1: Look for mailto links
@@ -94,7 +97,7 @@ class FacebookParser:
         except Exception as e:
             logger.error(f"Error extracting email: {e}")
     
-    def _extract_phone(self, soup: BeautifulSoup, data: FacebookPageData) -> None:
+    def _extract_phone(self, soup: BeautifulSoup, data: PageResult) -> None:
         """Extract phone numbers from the page."""
         try:
             # Look for tel: links
@@ -116,7 +119,7 @@ class FacebookParser:
         except Exception as e:
             logger.error(f"Error extracting phone: {e}")
     
-    def _extract_website(self, soup: BeautifulSoup, data: FacebookPageData) -> None:
+    def _extract_website(self, soup: BeautifulSoup, data: PageResult) -> None:
         """Extract website links from the page."""
         try:
             # Look for external links
@@ -128,7 +131,7 @@ class FacebookParser:
         except Exception as e:
             logger.error(f"Error extracting website: {e}")
     
-    def _extract_address(self, soup: BeautifulSoup, data: FacebookPageData) -> None:
+    def _extract_address(self, soup: BeautifulSoup, data: PageResult) -> None:
         """Extract address information from the page."""
         try:
             # Look for address in sections that might contain it
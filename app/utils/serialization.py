@@ -0,0 +1,37 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+
+    Uses orjson when it is installed and falls back to the standard library.
+
+    Args:
+        obj: A JSON-serializable object (dicts, lists and primitives)
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def ndjson_line(obj: Any) -> bytes:
+    """
+    Encode a single object as one line of newline-delimited JSON.
+
+    Args:
+        obj: A JSON-serializable object
+
+    Returns:
+        bytes: The encoded object terminated by a newline
+    """
+    return dumps(obj) + b'\n'
@@ -0,0 +1,37 @@
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables before importing modules that read settings at import time
+load_dotenv()
+
+from app.services.coordination import get_backend
+from app.services.worker import ScrapeWorker
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Run scrape workers pulling jobs from the shared coordination backend."""
+    backend = get_backend()
+    if backend is None:
+        raise SystemExit("COORDINATION_URL must be set to run workers")
+
+    concurrency = int(os.getenv("WORKER_CONCURRENCY", "1"))
+    logger.info(f"Starting {concurrency} scrape worker(s)")
+    await asyncio.gather(*(ScrapeWorker(backend).run() for _ in range(concurrency)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
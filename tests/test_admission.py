@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from app.services.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    LANE_BATCH,
+    LANE_INTERACTIVE,
+)
+
+
+def test_acquire_within_capacity():
+    """Test that requests are admitted immediately while slots are free."""
+    async def run():
+        controller = AdmissionController(max_in_flight=2, max_queue=2)
+        await controller.acquire("a")
+        await controller.acquire("b")
+        assert controller.in_flight == 2
+        controller.release("a")
+        controller.release("b")
+        assert controller.in_flight == 0
+    
+    asyncio.run(run())
+
+
+def test_queue_full_rejects_with_503():
+    """Test that requests are rejected when the wait queue is full."""
+    async def run():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, retry_after=5)
+        await controller.acquire("a")
+        waiter = asyncio.ensure_future(controller.acquire("b"))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await controller.acquire("c")
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.retry_after == 5
+        
+        controller.release("a")
+        await waiter
+        assert controller.in_flight == 1
+    
+    asyncio.run(run())
+
+
+def test_queue_timeout_rejects_with_503():
+    """Test that queued requests give up after the deadline."""
+    async def run():
+        controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=0.01)
+        await controller.acquire("a")
+        
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await controller.acquire("b")
+        assert excinfo.value.status_code == 503
+        assert controller.queued == 0
+    
+    asyncio.run(run())
+
+
+def test_fair_share_rejects_with_429():
+    """Test that a single client cannot take more than its share."""
+    async def run():
+        controller = AdmissionController(max_in_flight=1, max_queue=2)
+        await controller.acquire("a")
+        waiter = asyncio.ensure_future(controller.acquire("b"))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await controller.acquire("a")
+        assert excinfo.value.status_code == 429
+        
+        controller.release("a")
+        await waiter
+    
+    asyncio.run(run())
+
+
+def test_interactive_lane_admitted_before_batch():
+    """Test that interactive requests jump ahead of queued batch requests."""
+    async def run():
+        controller = AdmissionController(max_in_flight=1, max_queue=4)
+        await controller.acquire("a")
+        order = []
+        
+        async def request(key, lane):
+            await controller.acquire(key, lane)
+            order.append(key)
+        
+        batch = asyncio.ensure_future(request("batch", LANE_BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(request("interactive", LANE_INTERACTIVE))
+        await asyncio.sleep(0)
+        
+        controller.release("a")
+        await interactive
+        controller.release("interactive")
+        await batch
+        
+        assert order == ["interactive", "batch"]
+    
+    asyncio.run(run())
+
+
+def test_fair_share_key_ignores_unknown_api_keys():
+    """Test that only configured API keys get their own fair share."""
+    middleware = AdmissionMiddleware(None, AdmissionController(), api_keys=["tenant-a"])
+    
+    def scope(api_key):
+        return {"client": ("10.0.0.1", 1234), "headers": [(b"x-api-key", api_key.encode())]}
+    
+    assert middleware._fair_share_key(scope("tenant-a")) == "key:tenant-a"
+    assert middleware._fair_share_key(scope("made-up-1")) == "addr:10.0.0.1"
+    assert middleware._fair_share_key(scope("made-up-2")) == "addr:10.0.0.1"
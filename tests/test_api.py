@@ -1,8 +1,14 @@
 import pytest
 from fastapi.testclient import TestClient
-from app.main import app
-from unittest.mock import patch, MagicMock
+from app.main import app, admission_controller
+import asyncio
+import json
+import threading
+import httpx
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.models.schemas import FacebookPageData
+from app.models.result import PageResult
+from app.services.coordination import InMemoryBackend
 
 client = TestClient(app)
 
@@ -79,4 +85,191 @@ def test_scrape_endpoint_invalid_url():
     )
     
     # Check the response
-    assert response.status_code == 422  # Validation error
\ No newline at end of file
+    assert response.status_code == 422  # Validation error
+
+
+@patch("app.routes.scraper.FacebookScraper")
+def test_scrape_batch_endpoint(mock_scraper):
+    """Test the batch endpoint streams one NDJSON line per URL."""
+    mock_instance = MagicMock()
+    mock_scraper.return_value = mock_instance
+    mock_instance.scrape_page = AsyncMock(side_effect=[
+        PageResult(page_name="Test Page", email="test@example.com"),
+        Exception("Failed to scrape page"),
+    ])
+    
+    response = client.post(
+        "/api/scrape/batch",
+        json={"urls": ["https://www.facebook.com/testpage", "https://www.facebook.com/otherpage"]}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["success"] is True
+    assert lines[0]["data"]["email"] == "test@example.com"
+    assert lines[1]["success"] is False
+    assert lines[1]["error"] == "Failed to scrape page"
+
+
+@patch("app.routes.scraper.submit_job")
+@patch("app.routes.scraper.get_backend")
+def test_scrape_batch_endpoint_backend_failure(mock_get_backend, mock_submit_job):
+    """Test that a coordination backend error becomes a failed line instead of aborting the stream."""
+    mock_get_backend.return_value = MagicMock()
+    mock_submit_job.side_effect = [
+        {"success": True, "data": {"email": "test@example.com"}, "error": None},
+        ConnectionError("Backend unavailable"),
+    ]
+    
+    response = client.post(
+        "/api/scrape/batch",
+        json={"urls": ["https://www.facebook.com/testpage", "https://www.facebook.com/otherpage"]}
+    )
+    
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["success"] is True
+    assert lines[1] == {"success": False, "data": None, "error": "Backend unavailable"}
+
+
+def test_scrape_endpoint_memory_backend_served_in_process():
+    """Test that the API runs its own workers with the in-memory backend."""
+    backend = InMemoryBackend()
+    
+    def scrape(self, url, timeout=None):
+        return PageResult(page_url=url, email="test@example.com")
+    
+    with patch("app.main.get_backend", return_value=backend), \
+            patch("app.routes.scraper.get_backend", return_value=backend), \
+            patch("app.services.scraper.FacebookScraper.scrape_page_sync", scrape):
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post(
+                "/api/scrape",
+                json={"url": "https://www.facebook.com/testpage"}
+            )
+    
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    assert response.json()["data"]["email"] == "test@example.com"
+
+
+def test_scrape_batch_endpoint_too_many_urls():
+    """Test the batch endpoint rejects batches over the size limit."""
+    with patch("app.routes.scraper.BATCH_MAX_URLS", 1):
+        response = client.post(
+            "/api/scrape/batch",
+            json={"urls": ["https://www.facebook.com/testpage", "https://www.facebook.com/otherpage"]}
+        )
+    
+    assert response.status_code == 422
+
+
+def test_scrape_endpoint_concurrency_limited_by_admission():
+    """Test that concurrent scrapes run in parallel up to the in-flight limit."""
+    in_flight = []
+    # Each scrape waits for a second one to overlap with it, and fails if none does
+    overlap = threading.Barrier(2, timeout=5)
+    
+    def slow_scrape(self, url, timeout=None):
+        in_flight.append(admission_controller.in_flight)
+        overlap.wait()
+        return PageResult(page_url=url)
+    
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            return await asyncio.gather(*(
+                async_client.post("/api/scrape", json={"url": f"https://www.facebook.com/page{i}"})
+                for i in range(4)
+            ))
+    
+    with patch("app.services.scraper.FacebookScraper.scrape_page_sync", slow_scrape), \
+            patch.object(admission_controller, "max_in_flight", 2):
+        responses = asyncio.run(run())
+    
+    assert all(response.json()["success"] for response in responses)
+    assert max(in_flight) == 2
+
+
+def test_scrape_endpoint_rejected_when_saturated():
+    """Test the scrape endpoint returns 503 with Retry-After when at capacity."""
+    with patch.object(admission_controller, "max_in_flight", 0), \
+            patch.object(admission_controller, "max_queue", 0):
+        response = client.post(
+            "/api/scrape",
+            json={"url": "https://www.facebook.com/testpage"}
+        )
+    
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(admission_controller.retry_after)
+    assert response.json()["success"] is False
+
+
+@patch("app.routes.scraper.get_profiler")
+@patch("app.routes.scraper.FacebookScraper")
+def test_scrape_endpoint_profile_flag(mock_scraper, mock_get_profiler, tmp_path):
+    """Test that the profile query flag captures a profile listed by the admin endpoint."""
+    from app.services.profiling import Profiler
+    profiler = Profiler(directory=str(tmp_path))
+    mock_get_profiler.return_value = profiler
+    mock_instance = MagicMock()
+    mock_scraper.return_value = mock_instance
+    mock_instance.scrape_page_sync.return_value = PageResult(page_name="Test Page")
+    mock_instance.last_html = "<html></html>"
+    
+    response = client.post(
+        "/api/scrape?profile=1",
+        json={"url": "https://www.facebook.com/testpage"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["data"]["page_name"] == "Test Page"
+    assert len(profiler.recent) == 1
+    
+    with patch("app.routes.admin.get_profiler", return_value=profiler):
+        response = client.get("/api/admin/profiles")
+    assert response.status_code == 200
+    assert response.json()["profiles"][0]["url"] == "https://www.facebook.com/testpage"
+
+
+@patch("app.routes.scraper.get_profiler")
+@patch("app.routes.scraper.FacebookScraper")
+def test_scrape_endpoint_profile_header_requires_admin_token(mock_scraper, mock_get_profiler, tmp_path, monkeypatch):
+    """Test that on-demand profiling needs the admin token and accepts any header casing."""
+    from app.services.profiling import Profiler
+    profiler = Profiler(directory=str(tmp_path))
+    mock_get_profiler.return_value = profiler
+    mock_scraper.return_value.scrape_page_sync.return_value = PageResult(page_name="Test Page")
+    mock_scraper.return_value.last_html = "<html></html>"
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    
+    response = client.post(
+        "/api/scrape",
+        json={"url": "https://www.facebook.com/testpage"},
+        headers={"X-Profile": "TRUE"}
+    )
+    assert response.status_code == 403
+    assert len(profiler.recent) == 0
+    
+    response = client.post(
+        "/api/scrape",
+        json={"url": "https://www.facebook.com/testpage"},
+        headers={"X-Profile": "TRUE", "X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert len(profiler.recent) == 1
+
+
+@patch("app.routes.scraper.get_backend")
+def test_scrape_endpoint_profile_rejected_in_distributed_mode(mock_get_backend):
+    """Test that the profile flag is rejected when pages are scraped by remote workers."""
+    mock_get_backend.return_value = MagicMock()
+    
+    response = client.post(
+        "/api/scrape?profile=1",
+        json={"url": "https://www.facebook.com/testpage"}
+    )
+    
+    assert response.status_code == 400
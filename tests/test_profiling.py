@@ -0,0 +1,108 @@
+import os
+import time
+from unittest.mock import MagicMock
+from app.services.profiling import Profiler
+from app.services.scraper import FacebookScraper
+
+
+def test_capture_saves_profile_and_html(tmp_path):
+    """Test that a capture writes the profile files and the triggering HTML."""
+    profiler = Profiler(directory=str(tmp_path))
+    
+    with profiler.capture("https://www.facebook.com/testpage") as capture:
+        sum(i * i for i in range(1000))
+        capture.html = "<html><body>test</body></html>"
+    
+    files = os.listdir(capture.directory)
+    for name in ("profile.prof", "profile.txt", "allocations.txt", "page.html", "meta.json"):
+        assert name in files
+    with open(os.path.join(capture.directory, "page.html")) as f:
+        assert f.read() == "<html><body>test</body></html>"
+    assert profiler.slowest()[0]["id"] == capture.id
+
+
+def test_capture_includes_fetch(tmp_path):
+    """Test that the download shows up in the profile when fetching inline."""
+    response = MagicMock()
+    response.ok = True
+    response.encoding = 'utf-8'
+    response.raw.read1.side_effect = [b'<html><head><title>Test Page</title></head></html>', b'']
+    
+    def fetch_stub(url, **kwargs):
+        # Slow enough to rank among the most expensive calls
+        time.sleep(0.5)
+        return response
+    
+    scraper = FacebookScraper()
+    scraper.session = MagicMock()
+    scraper.session.get.side_effect = fetch_stub
+    profiler = Profiler(directory=str(tmp_path))
+    
+    with profiler.capture("https://www.facebook.com/testpage") as capture:
+        scraper.scrape_page_sync("https://www.facebook.com/testpage", threaded_fetch=False)
+    
+    with open(os.path.join(capture.directory, "profile.txt")) as f:
+        assert "fetch_stub" in f.read()
+
+
+def test_should_profile_sampling():
+    """Test that 1 in N requests are sampled and explicit requests always profile."""
+    profiler = Profiler(sample_rate=3)
+    
+    sampled = [profiler.should_profile() for _ in range(6)]
+    
+    assert sampled == [False, False, True, False, False, True]
+    assert Profiler().should_profile() is False
+    assert Profiler().should_profile(requested=True) is True
+
+
+def test_slowest_orders_by_duration(tmp_path):
+    """Test that the slowest captures are listed first."""
+    profiler = Profiler(directory=str(tmp_path))
+    for duration in (0.5, 2.0, 1.0):
+        profiler.recent.append({"id": str(duration), "duration": duration})
+    
+    slowest = profiler.slowest(limit=2)
+    
+    assert [c["duration"] for c in slowest] == [2.0, 1.0]
+
+
+def test_capture_prunes_old_directories(tmp_path):
+    """Test that only the newest capture directories are kept on disk."""
+    profiler = Profiler(directory=str(tmp_path), max_recent=2)
+    
+    captures = []
+    for _ in range(3):
+        with profiler.capture("https://www.facebook.com/testpage") as capture:
+            captures.append(capture)
+        # Make sure each capture has a distinct modification time
+        os.utime(capture.directory, (len(captures), len(captures)))
+    
+    remaining = sorted(os.listdir(tmp_path))
+    assert remaining == sorted(c.id for c in captures[1:])
+
+
+def test_prune_keeps_unrelated_directories(tmp_path):
+    """Test that pruning only deletes capture directories."""
+    os.makedirs(tmp_path / "precious")
+    os.utime(tmp_path / "precious", (0, 0))
+    profiler = Profiler(directory=str(tmp_path), max_recent=1)
+    
+    for _ in range(2):
+        with profiler.capture("https://www.facebook.com/testpage") as capture:
+            pass
+    
+    assert sorted(os.listdir(tmp_path)) == sorted(["precious", capture.id])
+
+
+def test_capture_skipped_while_another_runs(tmp_path):
+    """Test that overlapping captures do not profile twice."""
+    profiler = Profiler(directory=str(tmp_path))
+    
+    with profiler.capture("https://www.facebook.com/first") as first:
+        assert profiler.should_profile(requested=True) is False
+        with profiler.capture("https://www.facebook.com/second") as second:
+            assert second is None
+    
+    assert first is not None
+    assert len(profiler.recent) == 1
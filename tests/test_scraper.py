@@ -1,9 +1,17 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 from unittest.mock import patch, MagicMock
 from bs4 import BeautifulSoup
 import requests
+import urllib3
 from app.services.scraper import FacebookScraper
 from app.models.schemas import FacebookPageData
+from app.models.result import PageResult
+from app.utils.deadline import Deadline
+from app.utils.parser import FacebookParser
 
 
 @pytest.fixture
@@ -30,6 +38,8 @@ def mock_response():
     </html>
     """
     mock_resp.text = mock_resp.content.decode() if isinstance(mock_resp.content, bytes) else mock_resp.content
+    mock_resp.encoding = 'utf-8'
+    mock_resp.raw.read1.side_effect = [mock_resp.text.encode('utf-8'), b'']
     return mock_resp
 
 
@@ -46,7 +56,7 @@ async def test_scrape_page_success(mock_session, mock_response):
     result = await scraper.scrape_page("https://www.facebook.com/testpage")
     
     # Verify the result
-    assert isinstance(result, FacebookPageData)
+    assert isinstance(result, PageResult)
     assert result.page_name == "Test Page"
     assert result.email == "test@example.com"
     assert result.website is not None
@@ -99,4 +109,187 @@ def test_extract_emails_directly():
     # Verify the extracted emails
     assert len(emails) >= 2  # At least the mailto and text emails should be found
     assert "test1@example.com" in emails
-    assert "test2@example.com" in emails
\ No newline at end of file
+    assert "test2@example.com" in emails
+
+
+def test_page_result_to_schema():
+    """Test conversion of the internal result to the API schema."""
+    result = PageResult(
+        page_name="Test Page",
+        page_url="https://www.facebook.com/testpage/about",
+        email="test@example.com",
+    )
+    
+    schema = result.to_schema()
+    
+    assert isinstance(schema, FacebookPageData)
+    assert schema.page_name == "Test Page"
+    assert schema.email == "test@example.com"
+    assert schema.phone is None
+    assert result.to_dict() == dict(schema)
+
+
+def test_extract_emails_directly_expired_deadline():
+    """Test that direct extraction stops once the deadline has passed."""
+    html = '<html><body><a href="mailto:test1@example.com">Email 1</a></body></html>'
+    soup = BeautifulSoup(html, 'lxml')
+    
+    scraper = FacebookScraper()
+    emails = scraper._extract_emails_directly(soup, html, Deadline(0))
+    
+    assert emails == []
+
+
+def test_parse_page_expired_deadline():
+    """Test that the parser returns partial data flagged as incomplete."""
+    html = '<html><head><title>Test Page</title></head><body>test@example.com</body></html>'
+    soup = BeautifulSoup(html, 'lxml')
+    
+    result = FacebookParser().parse_page(soup, "https://www.facebook.com/testpage/about", Deadline(0))
+    
+    assert result.incomplete is True
+    assert result.page_url == "https://www.facebook.com/testpage/about"
+    assert result.email is None
+
+
+@patch("requests.Session")
+def test_scrape_page_deadline_during_fetch(mock_session):
+    """Test that a fetch timeout caused by the deadline returns an incomplete result."""
+    session_instance = MagicMock()
+    mock_session.return_value = session_instance
+    
+    def slow_get(url, **kwargs):
+        time.sleep(0.02)
+        raise requests.Timeout("Read timed out")
+    
+    session_instance.get.side_effect = slow_get
+    
+    scraper = FacebookScraper()
+    result = asyncio.run(scraper.scrape_page("https://www.facebook.com/testpage", timeout=0.01))
+    
+    assert isinstance(result, PageResult)
+    assert result.incomplete is True
+    assert result.page_url == "https://www.facebook.com/testpage/about"
+
+
+class SlowPageHandler(BaseHTTPRequestHandler):
+    """Serve the start of a page at once, then trickle the rest one byte at a time."""
+    
+    def do_GET(self):
+        head = b'<html><head><title>Slow Page</title></head><body>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(head) + 1000))
+        self.end_headers()
+        try:
+            self.wfile.write(head)
+            self.wfile.flush()
+            for _ in range(1000):
+                time.sleep(0.05)
+                self.wfile.write(b' ')
+                self.wfile.flush()
+        except OSError:
+            pass
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def test_scrape_page_deadline_during_slow_read():
+    """Test that a trickling body is cut off at the deadline and parsed as partial data."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowPageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        scraper = FacebookScraper()
+        start = time.monotonic()
+        result = scraper.scrape_page_sync(f"http://127.0.0.1:{server.server_port}/about", timeout=0.5)
+        elapsed = time.monotonic() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert elapsed < 1.5
+    assert result.incomplete is True
+    assert result.page_name == "Slow Page"
+
+
+class SlowHeadersHandler(SlowPageHandler):
+    """Send the headers one line at a time, then trickle the body."""
+    
+    def do_GET(self):
+        try:
+            for line in (b'HTTP/1.1 200 OK\r\n', b'Content-Type: text/html\r\n', b'Content-Length: 1000\r\n', b'\r\n'):
+                self.wfile.write(line)
+                self.wfile.flush()
+                time.sleep(0.1)
+            for _ in range(1000):
+                time.sleep(0.05)
+                self.wfile.write(b' ')
+                self.wfile.flush()
+        except OSError:
+            pass
+
+
+def test_fetch_thread_stops_after_deadline():
+    """Test that the reader thread gives up once the deadline passes while headers arrive."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHeadersHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        scraper = FacebookScraper()
+        result = scraper.scrape_page_sync(f"http://127.0.0.1:{server.server_port}/about", timeout=0.25)
+        assert result.incomplete is True
+        
+        readers = [t for t in threading.enumerate() if t.name == 'scraper-fetch']
+        assert readers
+        for reader in readers:
+            reader.join(1.0)
+        assert not any(reader.is_alive() for reader in readers)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_scrape_page_body_read_error():
+    """Test that a low-level error while reading the body is reported as a fetch failure."""
+    scraper = FacebookScraper()
+    response = MagicMock()
+    response.ok = True
+    response.encoding = 'utf-8'
+    response.raw.read1.side_effect = urllib3.exceptions.ProtocolError("Connection broken")
+    scraper.session = MagicMock()
+    scraper.session.get.return_value = response
+    
+    with pytest.raises(Exception, match="Failed to fetch the page"):
+        scraper.scrape_page_sync("https://www.facebook.com/testpage")
+
+
+def test_scrape_page_complete_when_no_email_found():
+    """Test that a page without an email is not flagged incomplete when all methods ran."""
+    scraper = FacebookScraper()
+    response = MagicMock()
+    response.ok = True
+    response.encoding = 'utf-8'
+    response.raw.read1.side_effect = [b'<html><head><title>No Email</title></head><body>Nothing here</body></html>', b'']
+    scraper.session = MagicMock()
+    scraper.session.get.return_value = response
+    
+    result = scraper.scrape_page_sync("https://www.facebook.com/testpage")
+    
+    assert result.email is None
+    assert result.incomplete is False
+
+
+def test_scrape_page_timeout_capped_at_default():
+    """Test that a client-supplied timeout cannot exceed the server default."""
+    scraper = FacebookScraper()
+    scraper.session = MagicMock()
+    scraper.session.get.side_effect = requests.RequestException("Connection error")
+    
+    with patch("app.services.scraper.DEFAULT_DEADLINE", 5.0):
+        with pytest.raises(Exception):
+            scraper.scrape_page_sync("https://www.facebook.com/testpage", timeout=1e9)
+    
+    args, kwargs = scraper.session.get.call_args
+    assert kwargs["timeout"][0] <= 5.0
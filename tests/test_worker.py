@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, AsyncMock, patch
+from app.models.result import PageResult
+from app.services.coordination import InMemoryBackend
+from app.services.worker import ScrapeWorker, cache_key, submit_job
+
+
+def make_scraper(**fields):
+    """Create a mock scraper returning a fixed result."""
+    scraper = MagicMock()
+    scraper.scrape_page = AsyncMock(return_value=PageResult(**fields))
+    return scraper
+
+
+def test_submit_job_processed_by_worker():
+    """Test a job round trip through the shared queue."""
+    async def run():
+        backend = InMemoryBackend()
+        scraper = make_scraper(page_name="Test Page", email="test@example.com")
+        worker = ScrapeWorker(backend, scraper=scraper)
+        
+        submitted = asyncio.ensure_future(submit_job(backend, "https://www.facebook.com/testpage"))
+        assert await worker.run_once(timeout=1)
+        result = await submitted
+        
+        assert result["success"] is True
+        assert result["data"]["email"] == "test@example.com"
+    
+    asyncio.run(run())
+
+
+def test_workers_share_cache():
+    """Test that a page scraped by one worker is not scraped again by another."""
+    async def run():
+        backend = InMemoryBackend()
+        first = make_scraper(email="test@example.com")
+        second = make_scraper(email="other@example.com")
+        job = {"id": "1", "url": "https://www.facebook.com/testpage", "timeout": None}
+        
+        await ScrapeWorker(backend, scraper=first).process(job)
+        result = await ScrapeWorker(backend, scraper=second).process(dict(job, id="2"))
+        
+        assert result["data"]["email"] == "test@example.com"
+        second.scrape_page.assert_not_called()
+        assert await backend.get_cached(cache_key(job["url"])) is not None
+    
+    asyncio.run(run())
+
+
+def test_incomplete_results_not_cached():
+    """Test that partial results are not stored in the shared cache."""
+    async def run():
+        backend = InMemoryBackend()
+        worker = ScrapeWorker(backend, scraper=make_scraper(incomplete=True))
+        job = {"id": "1", "url": "https://www.facebook.com/testpage", "timeout": None}
+        
+        result = await worker.process(job)
+        
+        assert result["data"]["incomplete"] is True
+        assert await backend.get_cached(cache_key(job["url"])) is None
+    
+    asyncio.run(run())
+
+
+def test_rate_budget_shared_between_workers():
+    """Test that the per-host rate limit applies across all workers."""
+    async def run():
+        backend = InMemoryBackend()
+        now = [100.5]
+        workers = [
+            ScrapeWorker(backend, scraper=MagicMock(), host_rate_limit=2, clock=lambda: now[0])
+            for _ in range(3)
+        ]
+        
+        await workers[0].acquire_rate_budget("www.facebook.com")
+        await workers[1].acquire_rate_budget("www.facebook.com")
+        
+        # The third request in the same window has to wait for the next one
+        third = asyncio.ensure_future(workers[2].acquire_rate_budget("www.facebook.com"))
+        await asyncio.sleep(0)
+        assert not third.done()
+        assert await backend.incr_window("rate:www.facebook.com:100", ttl=2) == 4
+        
+        third.cancel()
+        now[0] = 101.0
+        await workers[2].acquire_rate_budget("www.facebook.com")
+        assert await backend.incr_window("rate:www.facebook.com:101", ttl=2) == 2
+    
+    asyncio.run(run())
+
+
+def test_lock_release_requires_owner_token():
+    """Test that an expired lock taken over by another worker is not released by the first."""
+    async def run():
+        backend = InMemoryBackend()
+        first = await backend.try_lock("lock:page", ttl=0.01)
+        await asyncio.sleep(0.02)
+        second = await backend.try_lock("lock:page", ttl=10)
+        assert second is not None
+        
+        await backend.release_lock("lock:page", first)
+        assert await backend.try_lock("lock:page", ttl=10) is None
+        
+        await backend.release_lock("lock:page", second)
+        assert await backend.try_lock("lock:page", ttl=10) is not None
+    
+    asyncio.run(run())
+
+
+def test_workers_scrape_concurrently():
+    """Test that workers sharing an event loop scrape in parallel."""
+    # Each scrape only returns once all three are running at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    
+    def blocking_scrape(self, url, timeout=None):
+        barrier.wait()
+        return PageResult(page_url=url)
+    
+    async def run():
+        backend = InMemoryBackend()
+        workers = [ScrapeWorker(backend, host_rate_limit=10) for _ in range(3)]
+        jobs = [{"id": str(i), "url": f"https://www.facebook.com/page{i}", "timeout": None} for i in range(3)]
+        return await asyncio.gather(*(worker.process(job) for worker, job in zip(workers, jobs)))
+    
+    with patch("app.services.scraper.FacebookScraper.scrape_page_sync", blocking_scrape):
+        results = asyncio.run(run())
+    
+    assert all(result["success"] for result in results)
+
+
+def test_expired_job_dropped():
+    """Test that a job nobody waits for any more is neither scraped nor answered."""
+    async def run():
+        backend = InMemoryBackend()
+        scraper = make_scraper(page_name="Test Page")
+        worker = ScrapeWorker(backend, scraper=scraper, clock=lambda: 1000.0)
+        await backend.push_job({"id": "1", "url": "https://www.facebook.com/testpage",
+                                "timeout": None, "expires_at": 999.0})
+        
+        assert await worker.run_once(timeout=1)
+        assert scraper.scrape_page.await_count == 0
+        assert await backend.wait_result("1", timeout=0.05) is None
+    
+    asyncio.run(run())